@@ -2,86 +2,263 @@
 
 from __future__ import annotations
 
+import queue
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import pygame.mixer
 
 
+# 出典の違う効果音・ボイス間で音量を揃えるための基準値。
+# 再生ごとではなくロード時に一度だけ適用する。
+_NORMALIZED_VOLUME = 0.85
+
+
 class AudioManager:
     """GUI全体で共有する音声再生コンポーネント。"""
 
+    __slots__ = (
+        "_requested",
+        "_shut_down",
+        "_initialized",
+        "_move_sound",
+        "_move_sound_path",
+        "_voice_sounds",
+        "_voice_paths",
+        "_sound_cache",
+        "_path_str_cache",
+        "_path_exists_cache",
+        "_lock",
+        "_loader",
+        "_play_q",
+        "_play_thread",
+    )
+
     def __init__(self) -> None:
+        self._requested = False
+        self._shut_down = False
         self._initialized = False
         self._move_sound: Optional[pygame.mixer.Sound] = None
         self._move_sound_path: Optional[Path] = None
         self._voice_sounds: dict[str, pygame.mixer.Sound] = {}
         self._voice_paths: dict[str, Path] = {}
+        self._sound_cache: dict[str, pygame.mixer.Sound] = {}
+        self._path_str_cache: dict[Path, str] = {}
+        self._path_exists_cache: dict[Path, bool] = {}
+        self._lock = threading.Lock()
+        self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-load")
+        self._play_q: queue.SimpleQueue = queue.SimpleQueue()
+        self._play_thread = threading.Thread(
+            target=self._play_loop, name="audio-play", daemon=True
+        )
+        self._play_thread.start()
 
     def initialize(self) -> None:
-        """mixerを初期化する。複数回呼び出しても安全。"""
+        """音声再生を要求する。複数回呼び出しても安全。
 
-        if self._initialized:
+        mixer自体の初期化は最初に音声が必要になるまで遅延する。
+        音声を一度も使わないセッションではmixerを起動しない。
+        shutdown()後は終了状態のまま（ローダと再生スレッドは復活しない）で、
+        以降の登録・再生要求は黙って無視される。
+        """
+
+        if self._shut_down:
             return
-        pygame.mixer.init()
+        self._requested = True
+
+    def _ensure_mixer(self) -> bool:
+        """必要になった時点でmixerを初期化する。"""
+
+        if not self._requested:
+            return False
+        if self._initialized:
+            return True
+        # 短い効果音の単発再生しかしないので、固定フォーマット・小バッファ・
+        # 少チャンネルでmixerを最小構成にする。
+        try:
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+            pygame.mixer.set_num_channels(4)
+        except pygame.error as exc:
+            # 音声デバイスの無い環境では無音セッションに縮退する。
+            # shutdown()と同じ終了状態を立て、以降の登録・再生を黙って無視する。
+            sys.stderr.write(f"[warn] audio init failed: {exc}\n")
+            self._shut_down = True
+            self._requested = False
+            return False
         self._initialized = True
-        if self._move_sound_path is not None:
-            self.set_move_sound(self._move_sound_path)
-        if self._voice_paths:
-            for event, path in list(self._voice_paths.items()):
-                self.set_voice_sound(event, path)
+        self._loader.submit(self._preload_registered)
+        return True
+
+    def _preload_registered(self) -> None:
+        """登録済み音声を一括ロードする。パスのstatは各1回のみ。"""
+
+        move_path = self._move_sound_path
+        if move_path is not None and self._exists(move_path):
+            self._move_sound = self._load_sound(move_path)
+        loaded = {
+            event: self._load_sound(path)
+            for event, path in list(self._voice_paths.items())
+            if self._exists(path)
+        }
+        with self._lock:
+            self._voice_sounds.update(loaded)
+
+    def _posix(self, path: Path) -> str:
+        """resolve()+as_posix()の結果をパスごとに記憶する。"""
+
+        text = self._path_str_cache.get(path)
+        if text is None:
+            text = path.resolve().as_posix()
+            self._path_str_cache[path] = text
+        return text
+
+    def _exists(self, path: Path) -> bool:
+        """exists()のstat結果をパスごとに記憶する。"""
+
+        exists = self._path_exists_cache.get(path)
+        if exists is None:
+            exists = path.exists()
+            self._path_exists_cache[path] = exists
+        return exists
+
+    def _load_sound(self, path: Path) -> pygame.mixer.Sound:
+        """同一パスのSoundを共有する。デコード済みPCMは1本で済む。
+
+        mixer初期化後にロードするためSDL側でデコード時に出力フォーマットへ
+        変換済みとなり、play()時のリサンプリングは発生しない。音量の
+        正規化もここで済ませ、再生パスには何も残さない。
+        """
+
+        key = self._posix(path)
+        with self._lock:
+            sound = self._sound_cache.get(key)
+        if sound is None:
+            sound = pygame.mixer.Sound(key)
+            sound.set_volume(_NORMALIZED_VOLUME)
+            with self._lock:
+                sound = self._sound_cache.setdefault(key, sound)
+        return sound
+
+    def _submit_load(self, path: Path, store) -> None:
+        """Soundのデコードをバックグラウンドスレッドへ委譲する。
+
+        GUIスレッドをディスクI/Oやコーデック初期化で止めないため、
+        完了時コールバックで結果を格納する。
+        """
+
+        future = self._loader.submit(self._load_sound, path)
+        future.add_done_callback(store)
+
+    def _store_move_sound(self, future: Future) -> None:
+        if future.exception() is None:
+            self._move_sound = future.result()
+
+    def _make_voice_store(self, event: str):
+        def _store(future: Future) -> None:
+            if future.exception() is None:
+                with self._lock:
+                    self._voice_sounds[event] = future.result()
+
+        return _store
 
     def shutdown(self) -> None:
+        # 終了は不可逆。以降のinitialize()は_requestedを立て直さないため、
+        # 停止済みのExecutorへのsubmitや死んだ再生キューへの投入は起きない。
+        self._shut_down = True
+        self._requested = False
+        self._loader.shutdown(wait=False, cancel_futures=True)
+        self._play_q.put(None)
         if not self._initialized:
             return
         pygame.mixer.quit()
         self._initialized = False
         self._move_sound = None
-        self._voice_sounds.clear()
+        with self._lock:
+            self._voice_sounds.clear()
+            self._sound_cache.clear()
+        self._path_str_cache.clear()
+        self._path_exists_cache.clear()
 
     def set_move_sound(self, path: Optional[Path]) -> None:
         """指し手再生に用いる音声ファイルを設定する。"""
 
         self._move_sound_path = path
-        if not self._initialized:
+        if path is None:
+            self._move_sound = None
             return
-        if path and path.exists():
-            self._move_sound = pygame.mixer.Sound(path.as_posix())
-        else:
+        # 再登録時は古いstat結果を捨てて取り直す。
+        self._path_exists_cache.pop(path, None)
+        if not self._exists(path) or not self._ensure_mixer():
             self._move_sound = None
+            return
+        self._submit_load(path, self._store_move_sound)
+
+    @staticmethod
+    def _dup(sound: pygame.mixer.Sound) -> pygame.mixer.Sound:
+        """再生中のSoundと同じPCMバッファを包む複製を作る。
+
+        get_raw()は内部サンプルバッファをそのまま公開するため、
+        再デコードなしに重ね再生できる。
+        """
+
+        dup = pygame.mixer.Sound(buffer=sound.get_raw())
+        dup.set_volume(sound.get_volume())
+        return dup
+
+    def _play_loop(self) -> None:
+        """再生専用スレッド。GUIスレッドはSDL mixerのロックに触れない。"""
+
+        while True:
+            item = self._play_q.get()
+            if item is None:
+                break
+            sound, dup_on_busy = item
+            try:
+                if dup_on_busy and sound.get_num_channels() > 0:
+                    # 連続したbestmoveで前の再生が残っていても頭から重ねて鳴らす。
+                    sound = self._dup(sound)
+                sound.play()
+            except pygame.error:
+                pass
 
     def play_move_sound(self) -> None:
         """bestmove受信時などに呼び出される再生メソッド。"""
 
-        if not self._initialized:
+        if not self._ensure_mixer():
             return
-        if self._move_sound is not None:
-            self._move_sound.play()
+        sound = self._move_sound
+        if sound is not None:
+            self._play_q.put((sound, True))
 
     def set_voice_sound(self, event: str, path: Optional[Path]) -> None:
         """イベントに紐づくボイス音声を登録する。"""
 
         if path is None:
             self._voice_paths.pop(event, None)
-            self._voice_sounds.pop(event, None)
+            with self._lock:
+                self._voice_sounds.pop(event, None)
             return
 
         self._voice_paths[event] = path
-        if not self._initialized:
+        self._path_exists_cache.pop(path, None)
+        if not self._exists(path) or not self._ensure_mixer():
+            with self._lock:
+                self._voice_sounds.pop(event, None)
             return
-        if path.exists():
-            self._voice_sounds[event] = pygame.mixer.Sound(path.as_posix())
-        else:
-            self._voice_sounds.pop(event, None)
+        self._submit_load(path, self._make_voice_store(event))
 
     def play_voice(self, event: str) -> None:
-        """登録済みイベントのボイスを再生する。"""
+        """登録済みイベントのボイスを再生する。ロード未完了時は何もしない。"""
 
-        if not self._initialized:
+        if not self._ensure_mixer():
             return
-        sound = self._voice_sounds.get(event)
+        with self._lock:
+            sound = self._voice_sounds.get(event)
         if sound is not None:
-            sound.play()
+            self._play_q.put((sound, False))
 
 
 __all__ = ["AudioManager"]
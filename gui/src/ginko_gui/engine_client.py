@@ -2,8 +2,16 @@
 
 from __future__ import annotations
 
+import collections
+import os
+import selectors
 import subprocess
 import threading
+
+try:
+    import fcntl
+except ImportError:  # Windowsにはfcntlが無い
+    fcntl = None  # type: ignore[assignment]
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
@@ -11,10 +19,31 @@ from typing import Optional
 from PySide6.QtCore import QObject, Signal
 
 
+# 毎局送る固定コマンドは改行付きbytesを事前に用意してエンコードを省く。
+_COMMON_COMMANDS = {
+    command: (command + "\n").encode("utf-8")
+    for command in (
+        "usi",
+        "isready",
+        "usinewgame",
+        "stop",
+        "ponderhit",
+        "quit",
+        "legalmoves",
+        "position startpos",
+        "gameover win",
+        "gameover lose",
+        "gameover draw",
+    )
+}
+
+
 @dataclass(slots=True)
 class EngineConfig:
     executable: Path
     arguments: list[str] = field(default_factory=list)
+    # エンジンを固定するCPU集合。Noneなら既定（GUI用にコア0を空ける）。
+    affinity: Optional[set[int]] = None
 
     def command(self) -> list[str]:
         return [self.executable.as_posix(), *self.arguments]
@@ -23,18 +52,32 @@ class EngineConfig:
 class EngineClient(QObject):
     """USIエンジンを子プロセスとして管理し、標準入出力を行う。"""
 
-    line_received = Signal(str)
+    lines_received = Signal(list)
+    # 探索中に大量に流れる表示専用のinfo行。制御行とは別系統で届ける。
+    info_lines_received = Signal(list)
     error_occurred = Signal(str)
     process_exited = Signal(int)
 
+    # 読み取りスレッド→GUIスレッドの起床通知（内部用）。
+    _wake = Signal()
+
+    # GUI側の消化が追いつかない場合に表示専用info行を保持する上限。
+    # 制御行（bestmove等）は取りこぼせないため上限を設けない。
+    _QUEUE_MAX = 4096
+
     def __init__(self, config: EngineConfig, parent: Optional[QObject] = None) -> None:
         super().__init__(parent)
         self._config = config
-        self._process: Optional[subprocess.Popen[str]] = None
-        self._stdout_thread: Optional[threading.Thread] = None
+        self._process: Optional[subprocess.Popen[bytes]] = None
+        self._reader_thread: Optional[threading.Thread] = None
+        # Windowsフォールバックでのみ使うstderr専用スレッド。
         self._stderr_thread: Optional[threading.Thread] = None
         self._monitor_thread: Optional[threading.Thread] = None
         self._write_lock = threading.Lock()
+        # 制御行は無制限（1手ごとに高々数行）、info行のみ古いものから捨てる。
+        self._line_q: collections.deque[str] = collections.deque()
+        self._info_q: collections.deque[str] = collections.deque(maxlen=self._QUEUE_MAX)
+        self._wake.connect(self._drain_lines)
 
     def start(self) -> None:
         if self._process is not None:
@@ -44,61 +87,239 @@ class EngineClient(QObject):
             raise FileNotFoundError(f"Engine not found: {self._config.executable}")
 
         command = self._config.command()
+        popen_kwargs: dict = {"close_fds": True}
+        if os.name == "nt":
+            # conhostの起動とウィンドウのフラッシュを抑止する。
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            popen_kwargs["startupinfo"] = startupinfo
+            popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
         self._process = subprocess.Popen(
             command,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
+            bufsize=0,
+            **popen_kwargs,
         )
 
-        self._stdout_thread = threading.Thread(target=self._read_stdout_loop, daemon=True)
-        self._stdout_thread.start()
+        self._apply_affinity()
+        self._grow_stdout_pipe()
 
-        self._stderr_thread = threading.Thread(target=self._read_stderr_loop, daemon=True)
-        self._stderr_thread.start()
+        if os.name == "nt":
+            # Windowsのselect()はソケット専用でパイプを監視できないため、
+            # ストリームごとのブロッキング読み取りスレッドで代替する。
+            self._reader_thread = threading.Thread(
+                target=self._read_pipe_loop, args=("out",), daemon=True
+            )
+            self._stderr_thread = threading.Thread(
+                target=self._read_pipe_loop, args=("err",), daemon=True
+            )
+            self._stderr_thread.start()
+        else:
+            self._reader_thread = threading.Thread(target=self._read_streams_loop, daemon=True)
+        self._reader_thread.start()
 
         self._monitor_thread = threading.Thread(target=self._wait_for_exit, daemon=True)
         self._monitor_thread.start()
 
-    def _read_stdout_loop(self) -> None:
+    def _apply_affinity(self) -> None:
+        """エンジンプロセスをGUIと別のCPU集合へ寄せ、応答の揺らぎを抑える。"""
+
+        if not hasattr(os, "sched_setaffinity"):
+            return
+        assert self._process is not None
+        cpus = self._config.affinity
+        if cpus is None:
+            count = os.cpu_count() or 1
+            if count < 2:
+                return
+            cpus = set(range(1, count))
+        try:
+            os.sched_setaffinity(self._process.pid, cpus)
+        except OSError:
+            # 権限不足や不正なCPU指定ではOS既定のスケジューリングに任せる。
+            pass
+
+    def _grow_stdout_pipe(self) -> None:
+        """stdoutパイプのカーネルバッファを1MBへ広げる。
+
+        既定の64KBはinfo行の多いエンジンだと埋まりやすく、エンジン側の
+        write()がブロックして探索を止めてしまう。
+        """
+
+        if fcntl is None or not hasattr(fcntl, "F_SETPIPE_SZ"):
+            return
         assert self._process is not None and self._process.stdout is not None
-        for line in self._process.stdout:
-            if not line:
-                break
-            self.line_received.emit(line.rstrip())
+        try:
+            fcntl.fcntl(self._process.stdout.fileno(), fcntl.F_SETPIPE_SZ, 1 << 20)
+        except OSError:
+            # pipe-max-sizeの制限に当たった場合は既定サイズのままでよい。
+            pass
+
+    def _read_streams_loop(self) -> None:
+        """stdoutとstderrを1本のスレッドで多重読み取りする。
+
+        os.readで届いたチャンクをC実装のsplitで一括分割する。
+        行単位のreadlineループよりPythonレベルの呼び出しが大幅に減り、
+        1チャンク=1バッチとしてそのままemitできる。
+        """
 
-    def _read_stderr_loop(self) -> None:
-        assert self._process is not None and self._process.stderr is not None
-        for line in self._process.stderr:
-            if not line:
+        process = self._process
+        assert process is not None and process.stdout is not None and process.stderr is not None
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ, "out")
+        selector.register(process.stderr, selectors.EVENT_READ, "err")
+        tails = {"out": b"", "err": b""}
+        open_streams = 2
+        while open_streams:
+            for key, _ in selector.select():
+                stream = key.data
+                try:
+                    chunk = os.read(key.fileobj.fileno(), 65536)
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    open_streams -= 1
+                    continue
+                raw_lines = (tails[stream] + chunk).split(b"\n")
+                tails[stream] = raw_lines.pop()
+                if not raw_lines:
+                    continue
+                # USIプロトコルはASCIIのみなので固定デコーダで済ませる。
+                lines = [raw.decode("ascii", "replace").rstrip() for raw in raw_lines]
+                if stream == "out":
+                    self._enqueue_lines(lines)
+                else:
+                    for line in lines:
+                        self.error_occurred.emit(line)
+        selector.close()
+        if tails["out"]:
+            self._enqueue_lines([tails["out"].decode("ascii", "replace").rstrip()])
+        if tails["err"]:
+            self.error_occurred.emit(tails["err"].decode("ascii", "replace").rstrip())
+
+    def _read_pipe_loop(self, stream: str) -> None:
+        """Windows用フォールバック。1ストリームをブロッキングreadで読み続ける。
+
+        チャンク分割・デコード・振り分けはselector版と共通の経路に流す。
+        """
+
+        process = self._process
+        assert process is not None
+        pipe = process.stdout if stream == "out" else process.stderr
+        assert pipe is not None
+        fd = pipe.fileno()
+        tail = b""
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except OSError:
+                chunk = b""
+            if not chunk:
                 break
-            self.error_occurred.emit(line.rstrip())
+            raw_lines = (tail + chunk).split(b"\n")
+            tail = raw_lines.pop()
+            if not raw_lines:
+                continue
+            lines = [raw.decode("ascii", "replace").rstrip() for raw in raw_lines]
+            if stream == "out":
+                self._enqueue_lines(lines)
+            else:
+                for line in lines:
+                    self.error_occurred.emit(line)
+        if tail:
+            text = tail.decode("ascii", "replace").rstrip()
+            if stream == "out":
+                self._enqueue_lines([text])
+            else:
+                self.error_occurred.emit(text)
+
+    def _enqueue_lines(self, lines: list[str]) -> None:
+        """読み取りスレッド側で行を仕分けてキューへ積み、GUIスレッドを起こす。
+
+        表示にしか使わないinfo行は専用キューへ逃がし、GUIスレッドの
+        ディスパッチは制御行（bestmove等と、エラー通知を含むinfo string）
+        だけが通る。info側は満杯になるとdequeが古い行から捨てる。
+        """
+
+        line_q = self._line_q
+        info_q = self._info_q
+        for line in lines:
+            if line.startswith("info") and not line.startswith("info string"):
+                info_q.append(line)
+            else:
+                line_q.append(line)
+        self._wake.emit()
+
+    def _drain_lines(self) -> None:
+        """GUIスレッド側でキューを一括消化する。"""
+
+        queue = self._line_q
+        if queue:
+            batch: list[str] = []
+            while queue:
+                batch.append(queue.popleft())
+            self.lines_received.emit(batch)
+        info_q = self._info_q
+        if info_q:
+            info_batch: list[str] = []
+            while info_q:
+                info_batch.append(info_q.popleft())
+            self.info_lines_received.emit(info_batch)
 
     def _wait_for_exit(self) -> None:
-        assert self._process is not None
-        self._process.wait()
-        code = self._process.returncode or 0
+        # stop()が self._process をNoneに戻すため、属性ではなくローカルで持つ。
+        process = self._process
+        assert process is not None
+        process.wait()
+        code = process.returncode or 0
         self.process_exited.emit(code)
 
     def send_line(self, line: str) -> None:
         if self._process is None or self._process.stdin is None:
             raise RuntimeError("Engine process is not running")
+        # エンコードをロック外で済ませ、クリティカルセクションをwrite 1回に絞る。
+        # bufsize=0の生パイプなのでflushは不要。
+        payload = _COMMON_COMMANDS.get(line) or line.encode("utf-8") + b"\n"
         with self._write_lock:
-            self._process.stdin.write(line + "\n")
-            self._process.stdin.flush()
+            self._process.stdin.write(payload)
+
+    def send_raw(self, payload: bytes) -> None:
+        """エンコード済みのコマンド列（改行込み）をそのまま書き込む。
+
+        呼び出し側がペイロードを差分更新して使い回す場合のための入口。
+        """
+
+        if self._process is None or self._process.stdin is None:
+            raise RuntimeError("Engine process is not running")
+        with self._write_lock:
+            self._process.stdin.write(payload)
 
     def stop(self) -> None:
-        if self._process is None:
+        """エンジンへ終了を指示する。呼び出し元スレッドはブロックしない。"""
+
+        process = self._process
+        if process is None:
             return
         try:
             self.send_line("quit")
         except RuntimeError:
             pass
-        self._process.terminate()
-        self._process.wait(timeout=5)
+        process.terminate()
         self._process = None
+        # 応答しないエンジンはバックグラウンドでSIGKILLへ段階的に昇格させる。
+        # 終了通知は従来どおり監視スレッドの_wait_for_exitが担う。
+        threading.Thread(target=self._escalate_stop, args=(process,), daemon=True).start()
+
+    @staticmethod
+    def _escalate_stop(process: subprocess.Popen[bytes]) -> None:
+        try:
+            process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
 
 
 __all__ = ["EngineConfig", "EngineClient"]
@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
+import random
+import re
 import sys
-from collections import Counter
+from collections import Counter, deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional, Tuple
 
 from PySide6.QtCore import QPointF, QRectF, Qt, QSize, Signal, QTimer
-from PySide6.QtGui import QColor, QFont, QPainter, QPen, QBrush, QLinearGradient, QPainterPath
+from PySide6.QtGui import (
+    QBrush,
+    QColor,
+    QFont,
+    QLinearGradient,
+    QPainter,
+    QPainterPath,
+    QPen,
+    QPixmap,
+)
 from PySide6.QtWidgets import (
     QApplication,
     QHBoxLayout,
@@ -47,35 +58,129 @@ KANJI_MAP = {
     "+R": "竜",
 }
 PIECE_ORDER = ["R", "B", "G", "S", "P"]
-PROMOTABLE = {"P", "S", "B", "R"}
+PROMOTABLE = frozenset({"P", "S", "B", "R"})
+# USI打ち手の接頭辞（例: "P*"）。クリックのたびにf-stringを組まない。
+_DROP_PREFIX = {kind: kind + "*" for kind in PIECE_ORDER}
+
+# 擬似合法手の歩み方（先手視点の(d行, d列)。後手はd行の符号を反転）。
+_GOLD_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0))
+_ORTHO_DIRS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_DIAG_DIRS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+PIECE_STEPS: dict[str, tuple[tuple[int, int], ...]] = {
+    "K": _ORTHO_DIRS + _DIAG_DIRS,
+    "G": _GOLD_STEPS,
+    "S": ((-1, -1), (-1, 0), (-1, 1), (1, -1), (1, 1)),
+    "P": ((-1, 0),),
+    "+P": _GOLD_STEPS,
+    "+S": _GOLD_STEPS,
+    # 馬・竜は走りに加えて1升ずつの歩みを持つ。
+    "+B": _ORTHO_DIRS,
+    "+R": _DIAG_DIRS,
+}
+PIECE_SLIDES: dict[str, tuple[tuple[int, int], ...]] = {
+    "B": _DIAG_DIRS,
+    "R": _ORTHO_DIRS,
+    "+B": _DIAG_DIRS,
+    "+R": _ORTHO_DIRS,
+}
+# 成り段（敵陣最奥）。手番の色で引けば分岐なしに判定できる。
+_PROMOTION_RANK = {"b": "a", "w": "e"}
+# 色→成り段に属する升の集合。文字添字を取らず座標ごと1回の集合参照で判定する。
+_PROMOTION_SQUARES: dict[str, frozenset[str]] = {
+    color: frozenset(f"{file_value}{rank}" for file_value in FILE_VALUES)
+    for color, rank in _PROMOTION_RANK.items()
+}
+
+# Zobristハッシュ用の乱数表。シード固定で再現可能にしておく。
+_ZOBRIST_RNG = random.Random(0x51_4E_4B_30)
+_ZOBRIST_PIECE: dict[tuple[str, str, str], int] = {
+    (color, kind, f"{file_value}{rank_value}"): _ZOBRIST_RNG.getrandbits(64)
+    for color in ("b", "w")
+    for kind in KANJI_MAP
+    for file_value in FILE_VALUES
+    for rank_value in RANK_VALUES
+}
+# 持ち駒は(色, 駒種, 枚数)ごとに鍵を持ち、枚数が変わるたびに該当段をXORする。
+_ZOBRIST_HAND: dict[tuple[str, str, int], int] = {
+    (color, kind, count): _ZOBRIST_RNG.getrandbits(64)
+    for color in ("b", "w")
+    for kind in PIECE_ORDER
+    for count in range(1, 11)
+}
+_ZOBRIST_SIDE = _ZOBRIST_RNG.getrandbits(64)
 
 
 def opponent(color: str) -> str:
     return "w" if color == "b" else "b"
 
 
+# 25升しかないので座標変換は両方向とも表引きにする。
+_COORD_TO_RC: dict[str, Tuple[int, int]] = {
+    f"{BOARD_FILES - col}{RANK_VALUES[row]}": (row, col)
+    for row in range(BOARD_RANKS)
+    for col in range(BOARD_FILES)
+}
+# 二歩チェックで走査する各筋の5升。文字連結を繰り返さないよう前計算する。
+_FILE_SQUARES: dict[str, tuple[str, ...]] = {
+    str(file_value): tuple(f"{file_value}{rank}" for rank in RANK_VALUES)
+    for file_value in FILE_VALUES
+}
+
+# 逆方向は行・列が既にintで手元にあるので、tupleのネストで添字を直接使う。
+_RC_TO_COORD: tuple[tuple[str, ...], ...] = tuple(
+    tuple(f"{BOARD_FILES - col}{RANK_VALUES[row]}" for col in range(BOARD_FILES))
+    for row in range(BOARD_RANKS)
+)
+
+
 def coord_to_indices(coord: str) -> Tuple[int, int]:
-    file_value = int(coord[0])
-    rank_value = coord[1]
-    col = BOARD_FILES - file_value
-    row = ord(rank_value) - ord("a")
-    return row, col
+    return _COORD_TO_RC[coord]
 
 
 def indices_to_coord(row: int, col: int) -> str:
-    file_value = BOARD_FILES - col
-    rank_value = chr(ord("a") + row)
-    return f"{file_value}{rank_value}"
+    return _RC_TO_COORD[row][col]
 
 
-@dataclass
+@dataclass(slots=True)
 class Piece:
     color: str  # 'b' or 'w'
     kind: str   # e.g. 'P', '+P'
 
 
+# 駒は(色, 種類)の20通りしかないので全組み合わせを共有インスタンスにする。
+# 共有する以上、成りはkindの書き換えではなく成り駒への差し替えで表現する。
+_PIECE_CACHE: dict[tuple[str, str], Piece] = {
+    (color, kind): Piece(color=color, kind=kind)
+    for color in ("b", "w")
+    for kind in KANJI_MAP
+}
+
+
+def _get_piece(color: str, kind: str) -> Piece:
+    return _PIECE_CACHE[(color, kind)]
+
+
+_INITIAL_SFEN = "rbsgk/4p/5/P4/KGSBR b - 1"
+
+# SFENのトークン分割。Pythonの1文字ループよりC実装の正規表現で切り出す。
+_SFEN_BOARD_TOKEN_RE = re.compile(r"\+?[A-Za-z]|\d+")
+_SFEN_HAND_TOKEN_RE = re.compile(r"(\d*)([A-Za-z])")
+
+
 class BoardState:
-    """盤面と持ち駒の状態を管理する。"""
+    """盤面と持ち駒の状態を管理する。
+
+    盤面は座標文字列をキーとするdictで保持する。固定長配列の方が走査は
+    速いが、boardとhandsは外部（テストや呼び出し側）から直接読み書き
+    される公開インターフェースであり、表現の二重化は同期バグの温床に
+    なる。ホットパスは座標変換テーブルと一筋走査で既に短絡している。
+    """
+
+    # 初期局面のパース結果。最初のreset()で作り、以降は全インスタンスで共有する。
+    # 盤面は(座標, 駒)タプル列として凍結し、共有テンプレートへの書き込みを防ぐ。
+    _initial_template: Optional[
+        tuple[tuple[tuple[str, Piece], ...], dict[str, Counter[str]], str, int]
+    ] = None
 
     def __init__(self) -> None:
         self.board: dict[str, Piece] = {}
@@ -85,31 +190,72 @@ class BoardState:
         }
         self.side_to_move: str = "b"
         self.last_move: Optional[Tuple[Optional[str], str]] = None
+        self._zobrist: int = 0
         self.reset()
 
+    @classmethod
+    def empty(cls) -> "BoardState":
+        """初期配置を構築せず、空の盤面と手駒を持つ状態を返す。
+
+        任意局面を組み立てるテストや局面編集の入口。reset()のテンプレート
+        復元すら不要な場合に使う。
+        """
+
+        state = cls.__new__(cls)
+        state.board = {}
+        state.hands = {"b": Counter(), "w": Counter()}
+        state.side_to_move = "b"
+        state.last_move = None
+        state._zobrist = 0
+        return state
+
     def reset(self) -> None:
         self.board.clear()
         self.hands["b"].clear()
         self.hands["w"].clear()
         self.side_to_move = "b"
         self.last_move = None
-        self._load_from_sfen("rbsgk/4p/5/P4/KGSBR b - 1")
+        self._zobrist = 0
+        template = BoardState._initial_template
+        if template is None:
+            self._load_from_sfen(_INITIAL_SFEN)
+            BoardState._initial_template = (
+                tuple(self.board.items()),
+                {color: Counter(hand) for color, hand in self.hands.items()},
+                self.side_to_move,
+                self._zobrist,
+            )
+            return
+        # SFENを再パースせず、テンプレートの浅いコピーで復元する。
+        # Pieceは共有インスタンスなのでコピーは辞書だけで済み、
+        # reset()はパーサを通らずO(盤上駒数)のdict更新に収まる。
+        board, hands, side, zobrist = template
+        self.board.update(board)
+        for color, hand in hands.items():
+            self.hands[color].update(hand)
+        self.side_to_move = side
+        self._zobrist = zobrist
 
     def load_history(self, moves: list[str]) -> None:
         self.reset()
+        # 履歴の各手は適用時に検証済みなので、リプレイは検証を飛ばす。
         for move in moves:
-            self.apply_move(move)
+            self._apply_move_trusted(move)
 
     def apply_move(self, move: str) -> None:
-        if move == "resign":
-            self.side_to_move = opponent(self.side_to_move)
-            self.last_move = None
-            return
+        if move != "resign":
+            self._validate_move(move)
+        self._apply_move_trusted(move)
+
+    def _validate_move(self, move: str) -> None:
+        """手を適用せず、ルール違反ならValueErrorを送出する。"""
 
         side = self.side_to_move
-        if "*" in move:
-            piece_char, dest = move.split("*")
-            piece_kind = piece_char.upper()
+        board = self.board
+        # USI表記では打ち手は常に2文字目が'*'（例: P*3c）。部分文字列走査は不要。
+        if move[1] == "*":
+            piece_kind = move[0].upper()
+            dest = move[2:4]
             if piece_kind == "P":
                 if self._is_promotion_rank(dest, side):
                     raise ValueError("歩は最終段に打てません")
@@ -117,45 +263,73 @@ class BoardState:
                     raise ValueError("二歩は禁止です")
             if self.hands[side][piece_kind] <= 0:
                 raise ValueError("指定の持ち駒がありません")
-            if dest in self.board:
+            if dest in board:
                 raise ValueError("移動先が空いていません")
-            self.hands[side][piece_kind] -= 1
-            if self.hands[side][piece_kind] == 0:
-                del self.hands[side][piece_kind]
-            self.board[dest] = Piece(color=side, kind=piece_kind)
-            self.last_move = (None, dest)
         else:
-            promote = move.endswith("+")
-            from_sq = move[:2]
-            to_sq = move[2:4]
-            piece = self.board.get(from_sq)
+            piece = board.get(move[:2])
             if piece is None:
                 raise ValueError("移動元に駒がありません")
             if piece.color != side:
                 raise ValueError("相手の駒は動かせません")
-            target = self.board.get(to_sq)
+            target = board.get(move[2:4])
             if target and target.color == side:
                 raise ValueError("自駒の上には移動できません")
+            if move[-1] == "+" and self._base_kind(piece.kind) not in PROMOTABLE:
+                raise ValueError("この駒は成れません")
+
+    def _apply_move_trusted(self, move: str) -> None:
+        """検証済みの手をそのまま適用する。合法性は呼び出し側が保証する。"""
+
+        if move == "resign":
+            self.side_to_move = opponent(self.side_to_move)
+            self.last_move = None
+            self._zobrist ^= _ZOBRIST_SIDE
+            return
 
-            del self.board[from_sq]
+        # 手の適用はリプレイでも最内ループなので、
+        # 辞書と手駒Counterは属性参照を局所変数に束ねてから触る。
+        side = self.side_to_move
+        board = self.board
+        hand = self.hands[side]
+        zobrist = self._zobrist
+        if move[1] == "*":
+            piece_kind = move[0].upper()
+            dest = move[2:4]
+            held = hand[piece_kind]
+            # Counterは0エントリを許容するので、打ち切った駒種を消す必要はない。
+            # 削除はバケット再配置を伴い、参照側はどのみちget(kind, 0)で読む。
+            hand[piece_kind] = held - 1
+            board[dest] = _get_piece(side, piece_kind)
+            zobrist ^= _ZOBRIST_HAND[(side, piece_kind, held)]
+            zobrist ^= _ZOBRIST_PIECE[(side, piece_kind, dest)]
+            self.last_move = (None, dest)
+        else:
+            promote = move[-1] == "+"
+            from_sq = move[:2]
+            to_sq = move[2:4]
+            piece = board[from_sq]
+            target = board.get(to_sq)
+
+            del board[from_sq]
+            zobrist ^= _ZOBRIST_PIECE[(side, piece.kind, from_sq)]
 
             if target:
+                zobrist ^= _ZOBRIST_PIECE[(target.color, target.kind, to_sq)]
                 captured_kind = self._demote_kind(target.kind)
-                self.hands[side][captured_kind] += 1
+                held = hand[captured_kind] + 1
+                hand[captured_kind] = held
+                zobrist ^= _ZOBRIST_HAND[(side, captured_kind, held)]
 
             base = self._base_kind(piece.kind)
-            must_promote = base == "P" and self._is_promotion_rank(to_sq, side)
-            if promote and base not in PROMOTABLE:
-                raise ValueError("この駒は成れません")
-            if must_promote:
-                promote = True
-            if promote and base in PROMOTABLE:
-                piece.kind = PROMOTE_MAP.get(base, piece.kind)
+            if promote or (base == "P" and self._is_promotion_rank(to_sq, side)):
+                piece = _get_piece(side, PROMOTE_MAP[base])
 
-            self.board[to_sq] = piece
+            board[to_sq] = piece
+            zobrist ^= _ZOBRIST_PIECE[(side, piece.kind, to_sq)]
             self.last_move = (from_sq, to_sq)
 
         self.side_to_move = opponent(side)
+        self._zobrist = zobrist ^ _ZOBRIST_SIDE
 
     def piece_at(self, coord: str) -> Optional[Piece]:
         return self.board.get(coord)
@@ -163,15 +337,19 @@ class BoardState:
     def hand_counts(self, color: str) -> Counter[str]:
         return self.hands[color]
 
-    def repetition_key(self) -> tuple:
-        board_items = tuple(
-            sorted((coord, piece.color, piece.kind) for coord, piece in self.board.items())
-        )
-        hand_items = (
-            tuple(sorted(self.hands["b"].items())),
-            tuple(sorted(self.hands["w"].items())),
-        )
-        return board_items, hand_items, self.side_to_move
+    def repetition_key(self) -> int:
+        """盤・持ち駒・手番を織り込んだ64bit Zobristハッシュを返す。
+
+        apply_move内で増分更新されるため、呼び出しはO(1)で済む。
+        乱数表はシード固定なので、同一局面は実行をまたいでも同じ値になる。
+
+        注意: ハッシュが正しいのは局面の変更がapply_move / load_history /
+        reset経由の場合だけ。boardやhandsを直接書き換えると増分更新が
+        追従せず、千日手判定だけが古い局面を見続ける。直接変更した後は
+        reset()かload_history()で同期し直すこと。
+        """
+
+        return self._zobrist
 
     @staticmethod
     def _base_kind(kind: str) -> str:
@@ -183,55 +361,110 @@ class BoardState:
 
     @staticmethod
     def _is_promotion_rank(coord: str, color: str) -> bool:
-        rank = coord[1]
-        if color == "b":
-            return rank == "a"
-        return rank == "e"
+        return coord in _PROMOTION_SQUARES[color]
 
     def _has_pawn_on_file(self, color: str, file_char: str) -> bool:
-        for coord, piece in self.board.items():
-            if piece.color == color and self._base_kind(piece.kind) == "P" and coord[0] == file_char:
+        # 全升の走査ではなく、該当筋の5升だけを直接引く。boardは外部から
+        # 直接書き換えられるため、増分維持の歩フラグではなく毎回実盤を見る。
+        board_get = self.board.get
+        for coord in _FILE_SQUARES[file_char]:
+            piece = board_get(coord)
+            if piece is not None and piece.color == color and piece.kind in ("P", "+P"):
                 return True
         return False
 
+    def pseudo_legal_from(self, coord: str) -> set[str]:
+        """指定升の駒が動ける先（自殺手などは考慮しない擬似合法手）を返す。
+
+        エンジンのlegalmoves応答を待つ間、ハイライトを即時表示するための
+        近似。王手放置等は含み得るが、応答が届き次第正確な集合で上書き
+        される。
+        """
+
+        piece = self.board.get(coord)
+        if piece is None:
+            return set()
+        color = piece.color
+        # 歩み表は先手視点（-1が前進）。後手は行方向を反転する。
+        forward = 1 if color == "b" else -1
+        row, col = _COORD_TO_RC[coord]
+        board_get = self.board.get
+        rc_to_coord = _RC_TO_COORD
+        dests: set[str] = set()
+        for drow, dcol in PIECE_STEPS.get(piece.kind, ()):
+            r = row + drow * forward
+            c = col + dcol
+            if 0 <= r < BOARD_RANKS and 0 <= c < BOARD_FILES:
+                dest = rc_to_coord[r][c]
+                target = board_get(dest)
+                if target is None or target.color != color:
+                    dests.add(dest)
+        for drow, dcol in PIECE_SLIDES.get(piece.kind, ()):
+            r = row + drow
+            c = col + dcol
+            while 0 <= r < BOARD_RANKS and 0 <= c < BOARD_FILES:
+                dest = rc_to_coord[r][c]
+                target = board_get(dest)
+                if target is None:
+                    dests.add(dest)
+                    r += drow
+                    c += dcol
+                    continue
+                if target.color != color:
+                    dests.add(dest)
+                break
+        return dests
+
     def _load_from_sfen(self, sfen: str) -> None:
         board_part, turn_part, hand_part, _ply = sfen.split()
         ranks = board_part.split("/")
         for rank_index, rank_str in enumerate(ranks):
             file_value = BOARD_FILES
-            i = 0
-            while i < len(rank_str):
-                ch = rank_str[i]
-                if ch.isdigit():
-                    file_value -= int(ch)
-                    i += 1
+            # 1文字ずつのwhileループではなく、駒・空き数のトークン単位で回す。
+            for token in _SFEN_BOARD_TOKEN_RE.findall(rank_str):
+                if token[0].isdigit():
+                    file_value -= int(token)
                     continue
-                promoted = False
-                if ch == "+":
-                    promoted = True
-                    i += 1
-                    ch = rank_str[i]
+                ch = token[-1]
                 color = "b" if ch.isupper() else "w"
-                kind = ch.upper()
-                if promoted:
-                    kind = f"+{kind}"
+                kind = ch.upper() if token[0] != "+" else f"+{ch.upper()}"
                 coord = f"{file_value}{RANK_VALUES[rank_index]}"
-                self.board[coord] = Piece(color=color, kind=kind)
+                self.board[coord] = _get_piece(color, kind)
+                self._zobrist ^= _ZOBRIST_PIECE[(color, kind, coord)]
                 file_value -= 1
-                i += 1
 
         self.side_to_move = "b" if turn_part.lower() == "b" else "w"
+        if self.side_to_move == "w":
+            self._zobrist ^= _ZOBRIST_SIDE
         if hand_part != "-":
-            count_buffer = ""
-            for ch in hand_part:
-                if ch.isdigit():
-                    count_buffer += ch
-                    continue
-                count = int(count_buffer) if count_buffer else 1
-                count_buffer = ""
+            for count_str, ch in _SFEN_HAND_TOKEN_RE.findall(hand_part):
+                count = int(count_str) if count_str else 1
                 color = "b" if ch.isupper() else "w"
                 kind = ch.upper()
-                self.hands[color][kind] += count
+                held = self.hands[color][kind]
+                for level in range(held + 1, held + count + 1):
+                    self._zobrist ^= _ZOBRIST_HAND[(color, kind, level)]
+                self.hands[color][kind] = held + count
+
+
+# 盤面描画で毎フレーム使う色・ペンはインポート時に一度だけ作る。
+_BOARD_MARGIN = 30
+_LIGHT_SQUARE = QColor(237, 203, 151)
+_DARK_SQUARE = QColor(203, 163, 102)
+_LAST_MOVE_FILL = QColor(255, 230, 150, 180)
+_TARGET_FILL = QColor(120, 220, 150, 120)
+_TARGET_PEN = QPen(QColor(30, 120, 60), 2, Qt.DashLine)
+_SELECTION_FILL = QColor(120, 180, 255, 120)
+_GRID_PEN = QPen(Qt.black, 1)
+_LABEL_PEN = QPen(Qt.black)
+_PIECE_OUTLINE_COLOR = QColor(120, 90, 50)
+_PIECE_TEXT_BLACK = QColor(Qt.black)
+_PIECE_TEXT_WHITE = QColor(120, 40, 40)
+_PIECE_GRADIENT_STOPS = (
+    (0.0, QColor(250, 236, 210)),
+    (0.45, QColor(234, 205, 150)),
+    (1.0, QColor(198, 160, 110)),
+)
 
 
 class BoardWidget(QWidget):
@@ -245,95 +478,216 @@ class BoardWidget(QWidget):
         self._selected_square: Optional[str] = None
         self._drop_mode = False
         self._highlight_targets: set[str] = set()
+        self._square = 0.0
+        self._left = 0.0
+        self._top = 0.0
+        self._total_w = 0.0
+        self._total_h = 0.0
+        self._label_font = QFont(self.font())
+        self._piece_pixmap_cache: dict[int, QPixmap] = {}
+        self._bg_pixmap: Optional[QPixmap] = None
+        self._update_scheduled = False
+        # 次回再描画までに無効化された領域。Noneのうちは全面再描画。
+        self._dirty_all = False
+        self._dirty_rect: Optional[QRectF] = None
         self.setMinimumSize(QSize(480, 480))
+        self._update_geometry()
+
+    def resizeEvent(self, event) -> None:  # type: ignore[override]
+        super().resizeEvent(event)
+        self._update_geometry()
+
+    def _update_geometry(self) -> None:
+        """サイズ変更時のみ幾何とフォントを再計算し、描画・クリックで使い回す。"""
+
+        available_width = self.width() - _BOARD_MARGIN * 2
+        available_height = self.height() - _BOARD_MARGIN * 2
+        # 整数境界に揃った矩形の方がQtの塗りつぶしが速い。升は整数pxに丸める。
+        square = min(available_width // BOARD_FILES, available_height // BOARD_RANKS)
+        if square <= 0:
+            square = 1
+        self._square = square
+        self._total_w = square * BOARD_FILES
+        self._total_h = square * BOARD_RANKS
+        self._left = (self.width() - self._total_w) // 2
+        self._top = (self.height() - self._total_h) // 2
+        self._label_font = QFont(self.font())
+        self._label_font.setPointSizeF(square * 0.25)
+        # 座標ラベルの描画位置は幾何だけで決まるので、ここで確定させておく。
+        left = self._left
+        top = self._top
+        self._label_points: list[tuple[QPointF, str]] = [
+            (
+                QPointF(
+                    left + (BOARD_FILES - idx - 0.5) * square - square * 0.05,
+                    top - square * 0.1,
+                ),
+                str(file_value),
+            )
+            for idx, file_value in enumerate(FILE_VALUES)
+        ]
+        self._label_points.extend(
+            (QPointF(left - square * 0.2, top + (idx + 0.6) * square), rank_value)
+            for idx, rank_value in enumerate(RANK_VALUES)
+        )
+        # 各升の矩形も幾何だけで決まるので、座標→QRectFの表を作り直す。
+        # 描画側はこの表を参照するだけで、フレーム中にQRectFを生成しない。
+        self._square_rects: dict[str, QRectF] = {
+            coord: QRectF(left + col * square, top + row * square, square, square)
+            for coord, (row, col) in _COORD_TO_RC.items()
+        }
+        # blit先の左上点も前計算し、描画ループでのQPointF生成を無くす。
+        self._board_origin = QPointF(left, top)
+        self._square_points: dict[str, QPointF] = {
+            coord: rect.topLeft() for coord, rect in self._square_rects.items()
+        }
+        # 升サイズが変わると既存のレンダリング結果は使えない。
+        self._piece_pixmap_cache.clear()
+        self._bg_pixmap = None
 
     def set_board_state(self, state: BoardState) -> None:
         self._state = state
-        self.update()
+        self._schedule_update()
 
     def set_selection(self, square: Optional[str], drop_mode: bool) -> None:
+        if square == self._selected_square and drop_mode == self._drop_mode:
+            return
+        dirty = self._union_rects(self._selected_square, square)
         self._selected_square = square
         self._drop_mode = drop_mode
-        self.update()
+        self._schedule_update(dirty)
 
     def set_highlight_targets(self, targets: Iterable[str]) -> None:
-        self._highlight_targets = set(targets)
-        self.update()
-
-    def paintEvent(self, event) -> None:  # type: ignore[override]
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        margin = 30
-        available_width = self.width() - margin * 2
-        available_height = self.height() - margin * 2
-        square = min(available_width / BOARD_FILES, available_height / BOARD_RANKS)
-        total_width = square * BOARD_FILES
-        total_height = square * BOARD_RANKS
-        left = (self.width() - total_width) / 2
-        top = (self.height() - total_height) / 2
-
-        light = QColor(237, 203, 151)
-        dark = QColor(203, 163, 102)
-
+        new_targets = targets if isinstance(targets, (set, frozenset)) else set(targets)
+        if new_targets == self._highlight_targets:
+            return
+        # 実際に変わった升だけを無効化すればよい。
+        dirty = self._union_rects(*(self._highlight_targets ^ new_targets))
+        self._highlight_targets = new_targets
+        self._schedule_update(dirty)
+
+    def _union_rects(self, *coords: Optional[str]) -> Optional[QRectF]:
+        rects = self._square_rects
+        dirty: Optional[QRectF] = None
+        for coord in coords:
+            if coord is None:
+                continue
+            rect = rects[coord]
+            dirty = QRectF(rect) if dirty is None else dirty.united(rect)
+        return dirty
+
+    def _schedule_update(self, rect: Optional[QRectF] = None) -> None:
+        """同一イベントループ内の複数回の状態変更を1回の再描画にまとめる。
+
+        rect付きの呼び出しは変化した升の和集合だけを無効化し、Qtの
+        ペイント領域クリッピングで塗り直し量を抑える。rectなしは全面。
+        """
+
+        if rect is None:
+            self._dirty_all = True
+        elif not self._dirty_all:
+            dirty = self._dirty_rect
+            self._dirty_rect = QRectF(rect) if dirty is None else dirty.united(rect)
+        if self._update_scheduled:
+            return
+        self._update_scheduled = True
+        QTimer.singleShot(0, self._do_scheduled_update)
+
+    def _do_scheduled_update(self) -> None:
+        self._update_scheduled = False
+        dirty_all = self._dirty_all
+        dirty = self._dirty_rect
+        self._dirty_all = False
+        self._dirty_rect = None
+        if dirty_all or dirty is None:
+            self.update()
+        else:
+            # 破線枠や罫線のはみ出しぶんを数px広げて取り込む。
+            self.update(dirty.toAlignedRect().adjusted(-2, -2, 2, 2))
+
+    def _board_background(self) -> QPixmap:
+        """市松模様と罫線を一度だけラスタ化し、以後はblitで使い回す。
+
+        盤の静的部分は幾何が変わらない限り毎フレーム同一なので、
+        25升ぶんのfillRect+drawRectをリサイズ時の1回に畳み込む。
+        """
+
+        pixmap = self._bg_pixmap
+        if pixmap is not None:
+            return pixmap
+        square = self._square
+        pixmap = QPixmap(int(self._total_w) + 1, int(self._total_h) + 1)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        # 軸平行な矩形のみなのでアンチエイリアスは不要。
+        painter.setPen(_GRID_PEN)
         for row in range(BOARD_RANKS):
             for col in range(BOARD_FILES):
-                rect = QRectF(left + col * square, top + row * square, square, square)
-                color = light if (row + col) % 2 == 0 else dark
+                rect = QRectF(col * square, row * square, square, square)
+                color = _LIGHT_SQUARE if (row + col) % 2 == 0 else _DARK_SQUARE
                 painter.fillRect(rect, color)
-
-                painter.setPen(QPen(Qt.black, 1))
                 painter.drawRect(rect)
+        painter.end()
+        self._bg_pixmap = pixmap
+        return pixmap
 
+    def paintEvent(self, event) -> None:  # type: ignore[override]
+        # 軸平行の矩形とpixmapのblitばかりなので全面AAは掛けない。
+        # 曲線を含む駒形状のAAはpixmapレンダリング時に済んでいる。
+        painter = QPainter(self)
+
+        painter.drawPixmap(self._board_origin, self._board_background())
+        painter.setPen(_GRID_PEN)
+
+        rects = self._square_rects
         if self._state.last_move:
             from_sq, to_sq = self._state.last_move
-            highlight = QColor(255, 230, 150, 180)
-            for coord in filter(None, [from_sq, to_sq]):
-                row, col = coord_to_indices(coord)  # type: ignore[arg-type]
-                rect = QRectF(left + col * square, top + row * square, square, square)
-                painter.fillRect(rect, highlight)
+            if from_sq is not None:
+                painter.fillRect(rects[from_sq], _LAST_MOVE_FILL)
+            painter.fillRect(rects[to_sq], _LAST_MOVE_FILL)
 
         if self._highlight_targets:
-            target_fill = QColor(120, 220, 150, 120)
-            target_outline = QPen(QColor(30, 120, 60), 2, Qt.DashLine)
-            painter.setPen(target_outline)
+            painter.setPen(_TARGET_PEN)
             for coord in self._highlight_targets:
-                row, col = coord_to_indices(coord)
-                rect = QRectF(left + col * square, top + row * square, square, square)
-                painter.fillRect(rect, target_fill)
+                rect = rects[coord]
+                painter.fillRect(rect, _TARGET_FILL)
                 painter.drawRect(rect)
-            painter.setPen(QPen(Qt.black, 1))
+            painter.setPen(_GRID_PEN)
 
         if self._selected_square:
-            row, col = coord_to_indices(self._selected_square)
-            rect = QRectF(left + col * square, top + row * square, square, square)
-            painter.fillRect(rect, QColor(120, 180, 255, 120))
-
-        font = QFont(self.font())
-        font.setPointSizeF(square * 0.4)
-        painter.setFont(font)
-
+            painter.fillRect(rects[self._selected_square], _SELECTION_FILL)
+
+        # 駒は事前レンダリング済みpixmapのblitなので、ペン状態の切替は無い。
+        # ループ内で触る参照は局所変数に束ね、1駒あたりの名前解決を減らす。
+        cache = self._piece_pixmap_cache
+        points = self._square_points
+        draw_pixmap = painter.drawPixmap
+        size = self._square
         for coord, piece in self._state.board.items():
-            row, col = coord_to_indices(coord)
-            rect = QRectF(left + col * square, top + row * square, square, square)
-            self._draw_piece(painter, rect, piece)
-
-        painter.setPen(Qt.black)
-        font_small = QFont(self.font())
-        font_small.setPointSizeF(square * 0.25)
-        painter.setFont(font_small)
-
-        for idx, file_value in enumerate(FILE_VALUES):
-            text = str(file_value)
-            x = left + (BOARD_FILES - idx - 0.5) * square
-            painter.drawText(QPointF(x - square * 0.05, top - square * 0.1), text)
-        for idx, rank_value in enumerate(RANK_VALUES):
-            text = rank_value
-            y = top + (idx + 0.6) * square
-            painter.drawText(QPointF(left - square * 0.2, y), text)
-
-    def _draw_piece(self, painter: QPainter, rect: QRectF, piece: Piece) -> None:
-        painter.save()
+            # 盤上の駒は_get_pieceの共有インスタンスなので、同一性で引ける。
+            # 升サイズはキャッシュ世代内で一定（リサイズ時にclear済み）。
+            key = id(piece)
+            pixmap = cache.get(key)
+            if pixmap is None:
+                pixmap = self._render_piece_pixmap(piece, size)
+                cache[key] = pixmap
+            draw_pixmap(points[coord], pixmap)
+
+        # 文字の縁だけはアンチエイリアスを効かせる（全面AAより安価）。
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+        painter.setPen(_LABEL_PEN)
+        painter.setFont(self._label_font)
+
+        for point, text in self._label_points:
+            painter.drawText(point, text)
+
+    def _render_piece_pixmap(self, piece: Piece, size: int) -> QPixmap:
+        """(種類, 色, 升サイズ)ごとに一度だけベクタ描画を実行する。"""
+
+        pixmap = QPixmap(size, size)
+        pixmap.fill(Qt.transparent)
+        rect = QRectF(0, 0, size, size)
+        painter = QPainter(pixmap)
         if piece.color == "w":
             center = rect.center()
             painter.translate(center)
@@ -363,19 +717,17 @@ class BoardWidget(QWidget):
         path.closeSubpath()
 
         gradient = QLinearGradient(rect.topLeft(), rect.bottomLeft())
-        gradient.setColorAt(0.0, QColor(250, 236, 210))
-        gradient.setColorAt(0.45, QColor(234, 205, 150))
-        gradient.setColorAt(1.0, QColor(198, 160, 110))
+        for position, color in _PIECE_GRADIENT_STOPS:
+            gradient.setColorAt(position, color)
 
-        outline_color = QColor(120, 90, 50)
         painter.setRenderHint(QPainter.Antialiasing, True)
         painter.setBrush(QBrush(gradient))
-        painter.setPen(QPen(outline_color, max(1.0, width * 0.035)))
+        painter.setPen(QPen(_PIECE_OUTLINE_COLOR, max(1.0, width * 0.035)))
         painter.drawPath(path)
 
         inner_rect = rect.adjusted(width * 0.08, height * 0.05, -width * 0.08, -height * 0.05)
         label = KANJI_MAP.get(piece.kind, piece.kind)
-        text_color = Qt.black if piece.color == "b" else QColor(120, 40, 40)
+        text_color = _PIECE_TEXT_BLACK if piece.color == "b" else _PIECE_TEXT_WHITE
         text_font = QFont(self.font())
         text_font.setPointSizeF(height * 0.44)
         text_font.setBold(True)
@@ -383,30 +735,25 @@ class BoardWidget(QWidget):
         painter.setPen(text_color)
         painter.drawText(inner_rect, Qt.AlignCenter, label)
 
-        painter.restore()
+        painter.end()
+        return pixmap
 
     def mousePressEvent(self, event) -> None:  # type: ignore[override]
         if event.button() != Qt.LeftButton:
             return
-        margin = 30
-        available_width = self.width() - margin * 2
-        available_height = self.height() - margin * 2
-        square = min(available_width / BOARD_FILES, available_height / BOARD_RANKS)
-        total_width = square * BOARD_FILES
-        total_height = square * BOARD_RANKS
-        left = (self.width() - total_width) / 2
-        top = (self.height() - total_height) / 2
+        square = self._square
+        left = self._left
+        top = self._top
 
         x = event.position().x()
         y = event.position().y()
-        if not (left <= x <= left + total_width and top <= y <= top + total_height):
+        if not (left <= x <= left + self._total_w and top <= y <= top + self._total_h):
             return
         col = int((x - left) // square)
         row = int((y - top) // square)
         col = min(max(col, 0), BOARD_FILES - 1)
         row = min(max(row, 0), BOARD_RANKS - 1)
-        coord = indices_to_coord(row, col)
-        self.square_clicked.emit(coord)
+        self.square_clicked.emit(_RC_TO_COORD[row][col])
 
 
 class HandWidget(QWidget):
@@ -422,25 +769,41 @@ class HandWidget(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(6)
         self._buttons: dict[str, QPushButton] = {}
+        # 前回表示した枚数。変化した駒種のボタンだけsetTextする。
+        self._last_counts: dict[str, int] = {}
+        # 駒種→漢字ラベル。更新のたびにKANJI_MAPを引き直さない。
+        self._labels: dict[str, str] = {kind: KANJI_MAP[kind] for kind in PIECE_ORDER}
         for kind in PIECE_ORDER:
-            label = KANJI_MAP[kind]
+            label = self._labels[kind]
             button = QPushButton(f"{label} x0")
+            button.setObjectName(kind)
             button.setEnabled(selectable)
             if selectable:
-                button.clicked.connect(lambda _=False, k=kind: self.piece_selected.emit(k))
+                # 駒種ごとのlambdaを作らず、単一スロットでsender名から特定する。
+                button.clicked.connect(self._on_button_clicked)
             layout.addWidget(button)
             self._buttons[kind] = button
         layout.addStretch(1)
 
+    def _on_button_clicked(self) -> None:
+        self.piece_selected.emit(self.sender().objectName())
+
     def update_counts(self, counts: Counter[str]) -> None:
+        last_counts = self._last_counts
         for kind, button in self._buttons.items():
             count = counts.get(kind, 0)
-            label = KANJI_MAP[kind]
-            button.setText(f"{label} x{count}")
+            if count == last_counts.get(kind):
+                continue
+            last_counts[kind] = count
+            button.setText(f"{self._labels[kind]} x{count}")
             if self._selectable:
                 button.setEnabled(count > 0)
 
 
+# 選択なし時のハイライト集合。毎回frozenset()を作らず共有する。
+_EMPTY_TARGETS: frozenset[str] = frozenset()
+
+
 class MainWindow(QMainWindow):
     HUMAN_COLOR = "b"
     ENGINE_COLOR = "w"
@@ -452,25 +815,82 @@ class MainWindow(QMainWindow):
         self.audio_assets_dir.mkdir(parents=True, exist_ok=True)
         self.board_state = BoardState()
         self.move_history: list[str] = []
+        # positionコマンドのエンコード済みペイロード。手が増えるたびに
+        # joinとutf-8エンコードをやり直さず、末尾に差分追記する。
+        self._position_cmd_b = b"position startpos"
         self.selected_square: Optional[str] = None
         self.selected_drop_kind: Optional[str] = None
         self.awaiting_engine_move = False
         self.pending_user_move: Optional[str] = None
         self.usi_ready = False
         self.legal_moves: list[str] = []
+        # legalmoves応答ごとに作る索引。ハイライト計算は表引きで済ませる。
+        self._moves_by_from: dict[str, frozenset[str]] = {}
+        self._drops_by_kind: dict[str, frozenset[str]] = {}
+        self._legal_moves_set: frozenset[str] = frozenset()
+        self._last_highlight_targets: frozenset[str] = _EMPTY_TARGETS
+        self._last_status_msg = ""
+        self._last_selection: tuple[Optional[str], bool] = (None, False)
+        # _refresh_viewsの遅延実行が予約済みかどうか。
+        self._refresh_pending = False
+        # 終局判定の入力（合法手・王手状態）が変わるたびに進める世代番号。
+        self._state_epoch = 0
+        self._last_gameover_check_epoch = -1
         self.waiting_legal_moves = False
         self.in_check = False
         self.game_over = False
-        self.position_counts: Counter = Counter()
-        self.position_history: list[tuple] = []
+        # キーはrepetition_key()の64bit整数ハッシュ。タプルより比較・ハッシュが軽い。
+        # 履歴は直近N局面だけ保持し、溢れた分はカウントからも外して
+        # 長時間のAI同士対局でも際限なく成長しないようにする。
+        self.position_counts: Counter[int] = Counter()
+        self.position_history: deque[int] = deque(maxlen=1024)
         self.ai_vs_ai_mode = False
+        # AI同士の自動対局では音声は純粋なオーバーヘッドなので止める。
+        self.audio_enabled = True
+        # クリックごとに参照する値はモード切替時だけ更新する。
+        self._human_engine_controlled = False
+        self._human_promo_squares = _PROMOTION_SQUARES[self.HUMAN_COLOR]
+        self._rebuild_actor_labels()
         self.engine_depth = 3
         self.engine_randomness = 200
         self.ai_turn_delay_ms = 1000
         self._pending_ai_start: Optional[str] = None
+        # info行は即時表示せず溜めておき、タイマーで約20Hzにまとめて流す。
+        self._info_buffer: list[str] = []
+        self._info_flush_timer = QTimer(self)
+        self._info_flush_timer.setInterval(50)
+        self._info_flush_timer.setSingleShot(True)
+        self._info_flush_timer.timeout.connect(self._flush_info_buffer)
+        # ログも同様にバッファし、レイアウト計算を周期ごと1回に抑える。
+        self._log_buffer: list[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setInterval(50)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.timeout.connect(self._flush_log_buffer)
+
+        # _build_ui前に呼ばれうる更新パスが参照するウィジェットは、
+        # hasattrではなくNone比較で済むよう先に定義しておく。
+        self.ai_delay_label: Optional[QLabel] = None
+        self.ai_delay_slider: Optional[QSlider] = None
+        self.depth_label: Optional[QLabel] = None
+        self.randomness_label: Optional[QLabel] = None
+        self.cancel_drop_button: Optional[QPushButton] = None
+        self.check_indicator: Optional[QLabel] = None
+
+        # USI応答の先頭トークン→ハンドラ。_handle_engine_lineの分岐を定数時間にする。
+        self._usi_handlers = {
+            "id": self._on_id_line,
+            "usiok": self._on_usiok,
+            "readyok": self._on_readyok,
+            "info": self._on_info_line,
+            "legalmoves": self._handle_legalmoves_response,
+            "checkstate": self._handle_checkstate,
+            "bestmove": self._on_bestmove_line,
+        }
 
         self.engine_client = EngineClient(EngineConfig(executable=self._default_engine_path()))
-        self.engine_client.line_received.connect(self._handle_engine_line)
+        self.engine_client.lines_received.connect(self._handle_engine_lines)
+        self.engine_client.info_lines_received.connect(self._handle_engine_info_lines)
         self.engine_client.error_occurred.connect(self._handle_engine_error)
         self.engine_client.process_exited.connect(self._handle_engine_exit)
 
@@ -482,15 +902,30 @@ class MainWindow(QMainWindow):
     def _is_engine_controlled(self, color: str) -> bool:
         if color == self.ENGINE_COLOR:
             return True
-        return self.ai_vs_ai_mode
+        return self._human_engine_controlled
 
     def _format_actor_label(self, color: str) -> str:
-        base = "先手" if color == self.HUMAN_COLOR else "後手"
-        if self._is_engine_controlled(color):
-            return f"{base}AI"
-        if color == self.HUMAN_COLOR:
-            return f"{base}（あなた）"
-        return base
+        return self._label_by_color[color]
+
+    def _rebuild_actor_labels(self) -> None:
+        """モード切替時だけ呼び、手番ごとの表示文字列を作り直す。
+
+        ラベルと定型メッセージは毎手参照されるため、都度のf-string組み立て
+        ではなく辞書引きで済むようにしておく。
+        """
+
+        labels: dict[str, str] = {}
+        for color in ("b", "w"):
+            base = "先手" if color == self.HUMAN_COLOR else "後手"
+            if self._is_engine_controlled(color):
+                labels[color] = f"{base}AI"
+            elif color == self.HUMAN_COLOR:
+                labels[color] = f"{base}（あなた）"
+            else:
+                labels[color] = base
+        self._label_by_color = labels
+        self._turn_msg = {color: f"{label}の番です" for color, label in labels.items()}
+        self._thinking_msg = {color: f"{label}の思考中…" for color, label in labels.items()}
 
     def _format_ai_delay_text(self) -> str:
         seconds = self.ai_turn_delay_ms / 1000
@@ -503,9 +938,9 @@ class MainWindow(QMainWindow):
         return f"探索深さ: {self.engine_depth}手先"
 
     def _update_ai_delay_display(self) -> None:
-        if hasattr(self, "ai_delay_label"):
+        if self.ai_delay_label is not None:
             self.ai_delay_label.setText(self._format_ai_delay_text())
-        if hasattr(self, "ai_delay_slider"):
+        if self.ai_delay_slider is not None:
             self.ai_delay_slider.setEnabled(self.ai_vs_ai_mode)
 
     def _handle_ai_delay_changed(self, value: int) -> None:
@@ -514,16 +949,16 @@ class MainWindow(QMainWindow):
 
     def _handle_depth_changed(self, value: int) -> None:
         self.engine_depth = max(1, int(value))
-        if hasattr(self, "depth_label"):
+        if self.depth_label is not None:
             self.depth_label.setText(self._format_depth_text())
 
     def _handle_randomness_changed(self, value: int) -> None:
         self.engine_randomness = max(0, int(value))
-        if hasattr(self, "randomness_label"):
+        if self.randomness_label is not None:
             self.randomness_label.setText(self._format_randomness_text())
 
     def _update_player_controls(self) -> None:
-        human_turn_available = not self._is_engine_controlled(self.HUMAN_COLOR) and not self.game_over
+        human_turn_available = not self._human_engine_controlled and not self.game_over
         can_interact = human_turn_available and not self.awaiting_engine_move
         self.board_widget.setEnabled(can_interact)
         self.sente_hand.setEnabled(can_interact)
@@ -558,7 +993,7 @@ class MainWindow(QMainWindow):
             self._pending_ai_start = side
             seconds = delay / 1000
             actor = self._format_actor_label(side)
-            self.statusBar().showMessage(f"{actor}の思考開始を{seconds:.1f}秒待機…")
+            self._set_status(f"{actor}の思考開始を{seconds:.1f}秒待機…")
             QTimer.singleShot(delay, lambda: self._handle_ai_delay_expired(side))
             return
 
@@ -591,16 +1026,15 @@ class MainWindow(QMainWindow):
 
         self._clear_drop_selection()
         self.selected_square = None
-        self.board_widget.set_selection(None, drop_mode=False)
+        self._set_selection(None, drop_mode=False)
         self.awaiting_engine_move = True
         self.pending_user_move = None
         self._update_player_controls()
-        self._sync_engine_position()
-        self.engine_client.send_line(
-            f"go depth {self.engine_depth} random {self.engine_randomness}"
+        self.engine_client.send_raw(
+            self._position_cmd_b
+            + f"\ngo depth {self.engine_depth} random {self.engine_randomness}\n".encode("ascii")
         )
-        actor = self._format_actor_label(side)
-        self.statusBar().showMessage(f"{actor}の思考中…")
+        self._set_status(self._thinking_msg[side])
 
     def _build_ui(self) -> None:
         self.setWindowTitle("Ginko 5x5 Shogi")
@@ -692,8 +1126,16 @@ class MainWindow(QMainWindow):
 
         self.log_view = QTextEdit()
         self.log_view.setReadOnly(True)
+        # undoスタックはappendのたびに履歴を貯め込むログ用途では無駄が大きい。
+        self.log_view.setUndoRedoEnabled(False)
+        # 指し手ログは1手2行程度なので、500ブロックで長時間対局分を賄える。
+        self.log_view.document().setMaximumBlockCount(500)
         self.info_view = QTextEdit()
         self.info_view.setReadOnly(True)
+        self.info_view.setUndoRedoEnabled(False)
+        # infoは最新の読み筋だけ見えればよい。深い探索のスパムで
+        # レイアウトコストが増えないよう上限を詰める。
+        self.info_view.document().setMaximumBlockCount(200)
         log_header = QHBoxLayout()
         log_header.setContentsMargins(0, 0, 0, 0)
         log_header.setSpacing(6)
@@ -710,7 +1152,7 @@ class MainWindow(QMainWindow):
 
         root.addLayout(right_panel, stretch=2)
         self.setCentralWidget(central)
-        self.statusBar().showMessage("エンジン初期化中…")
+        self._set_status("エンジン初期化中…")
 
         self._update_check_indicator()
         self._refresh_views()
@@ -762,6 +1204,9 @@ class MainWindow(QMainWindow):
                 return
 
         self.ai_vs_ai_mode = enable
+        self._human_engine_controlled = enable
+        self.audio_enabled = not enable
+        self._rebuild_actor_labels()
         self.ai_mode_button.setText("AI同士対局モード: ON" if enable else "AI同士対局モード: OFF")
         self._append_info(f"info string ai_vs_ai_mode={'on' if enable else 'off'}")
         self._pending_ai_start = None
@@ -777,11 +1222,13 @@ class MainWindow(QMainWindow):
     def _handle_new_game(self) -> None:
         self.board_state.reset()
         self.move_history.clear()
+        self._position_cmd_b = b"position startpos"
         self.selected_square = None
         self._clear_drop_selection()
         self.awaiting_engine_move = False
         self.pending_user_move = None
         self.legal_moves.clear()
+        self._index_legal_moves(self.legal_moves)
         self.waiting_legal_moves = False
         self.in_check = False
         self.game_over = False
@@ -795,21 +1242,24 @@ class MainWindow(QMainWindow):
             self._request_legal_moves()
         self._refresh_views()
         self.info_view.clear()
-        self.audio_manager.play_voice("game_start")
+        # 前局のバッファ済みinfo行がクリア後のビューへ流れ込まないようにする。
+        self._info_buffer.clear()
+        if self.audio_enabled:
+            self.audio_manager.play_voice("game_start")
 
     def _handle_resign(self) -> None:
         QMessageBox.information(self, "投了", "先手が投了しました。")
-        self.move_history.append("resign")
+        self._append_history("resign")
         self.awaiting_engine_move = False
-        self.statusBar().showMessage("対局終了")
+        self._set_status("対局終了")
 
     def _handle_drop_selection(self, kind: str) -> None:
-        if self.awaiting_engine_move or self.game_over or self._is_engine_controlled(self.HUMAN_COLOR):
+        if self.awaiting_engine_move or self.game_over or self._human_engine_controlled:
             return
         self.selected_drop_kind = kind
         self.selected_square = None
-        self.board_widget.set_selection(None, drop_mode=True)
-        self.statusBar().showMessage(f"{KANJI_MAP[kind]} を打つ場所を選択")
+        self._set_selection(None, drop_mode=True)
+        self._set_status(f"{KANJI_MAP[kind]} を打つ場所を選択")
         self._update_highlight_targets()
         self.cancel_drop_button.setEnabled(True)
 
@@ -817,7 +1267,7 @@ class MainWindow(QMainWindow):
         if (
             self.awaiting_engine_move
             or self.game_over
-            or self._is_engine_controlled(self.HUMAN_COLOR)
+            or self._human_engine_controlled
         ):
             return
 
@@ -826,7 +1276,7 @@ class MainWindow(QMainWindow):
             if piece is not None:
                 self._append_log("その升には打てません")
                 return
-            move = f"{self.selected_drop_kind}*{coord}"
+            move = _DROP_PREFIX[self.selected_drop_kind] + coord
             if not self._apply_human_move(move):
                 return
             self._clear_drop_selection()
@@ -835,15 +1285,15 @@ class MainWindow(QMainWindow):
         if self.selected_square is None:
             if piece and piece.color == self.HUMAN_COLOR:
                 self.selected_square = coord
-                self.board_widget.set_selection(coord, drop_mode=False)
-                self.statusBar().showMessage(f"{coord} から移動する先を選択")
+                self._set_selection(coord, drop_mode=False)
+                self._set_status(f"{coord} から移動する先を選択")
                 self._update_highlight_targets()
             return
 
         if coord == self.selected_square:
             self.selected_square = None
-            self.board_widget.set_selection(None, drop_mode=False)
-            self.statusBar().showMessage("選択を解除しました")
+            self._set_selection(None, drop_mode=False)
+            self._set_status("選択を解除しました")
             self._update_highlight_targets()
             return
 
@@ -851,26 +1301,26 @@ class MainWindow(QMainWindow):
         if move is None:
             return
         self.selected_square = None
-        self.board_widget.set_selection(None, drop_mode=False)
+        self._set_selection(None, drop_mode=False)
         self._update_highlight_targets()
         self._apply_human_move(move)
 
     def _handle_cancel_drop(self) -> None:
         if (
             not self.selected_drop_kind
-            or self._is_engine_controlled(self.HUMAN_COLOR)
+            or self._human_engine_controlled
         ):
             return
         self._clear_drop_selection()
-        self.statusBar().showMessage("持ち駒の選択を解除しました")
+        self._set_status("持ち駒の選択を解除しました")
 
     def _clear_drop_selection(self) -> None:
         had_drop = self.selected_drop_kind is not None
         self.selected_drop_kind = None
-        if hasattr(self, "cancel_drop_button"):
+        if self.cancel_drop_button is not None:
             self.cancel_drop_button.setEnabled(False)
         if had_drop:
-            self.board_widget.set_selection(None, drop_mode=False)
+            self._set_selection(None, drop_mode=False)
         self._update_highlight_targets()
 
     def _build_move_string(self, from_sq: str, to_sq: str) -> Optional[str]:
@@ -885,11 +1335,11 @@ class MainWindow(QMainWindow):
 
         base = BoardState._base_kind(piece.kind)
         promote = False
-        if base == "P" and self._is_promotion_rank(to_sq, self.HUMAN_COLOR):
+        promo_squares = self._human_promo_squares
+        if base == "P" and to_sq in promo_squares:
             promote = True
         elif base in PROMOTABLE and (
-            self._is_promotion_rank(from_sq, self.HUMAN_COLOR)
-            or self._is_promotion_rank(to_sq, self.HUMAN_COLOR)
+            from_sq in promo_squares or to_sq in promo_squares
         ):
             promote = (
                 QMessageBox.question(
@@ -901,116 +1351,190 @@ class MainWindow(QMainWindow):
                 == QMessageBox.Yes
             )
 
-        move = f"{from_sq}{to_sq}"
+        move = from_sq + to_sq
         if promote:
             move += "+"
         return move
 
+    def _index_legal_moves(self, moves: list[str]) -> None:
+        """legalmoves応答を移動元・打ち駒種ごとの索引に変換する。
+
+        ハイライト計算はクリックや再描画のたびに走るので、全手の
+        startswith走査ではなくここで一度だけ振り分けておく。
+        """
+
+        by_from = self._moves_by_from
+        by_kind = self._drops_by_kind
+        by_from.clear()
+        by_kind.clear()
+        for move in moves:
+            if move[1] == "*":
+                by_kind.setdefault(move[0], set()).add(move[2:4])
+            else:
+                by_from.setdefault(move[:2], set()).add(move[2:4])
+        # ハイライト側は集合をそのまま掲出するため、ここで凍結しておく。
+        for key, dests in by_from.items():
+            by_from[key] = frozenset(dests)
+        for key, dests in by_kind.items():
+            by_kind[key] = frozenset(dests)
+        self._legal_moves_set = frozenset(moves)
+        self._state_epoch += 1
+
     def _update_highlight_targets(self) -> None:
-        targets: set[str] = set()
+        empty = _EMPTY_TARGETS
         if self.selected_drop_kind:
-            prefix = f"{self.selected_drop_kind.upper()}*"
-            for move in self.legal_moves:
-                if move.startswith(prefix):
-                    dest = move.split("*", 1)[1][:2]
-                    targets.add(dest)
+            targets = self._drops_by_kind.get(self.selected_drop_kind.upper(), empty)
         elif self.selected_square:
-            prefix = self.selected_square
-            for move in self.legal_moves:
-                if move.startswith(prefix):
-                    targets.add(move[2:4])
-        self.board_widget.set_highlight_targets(sorted(targets))
+            targets = self._moves_by_from.get(self.selected_square)
+            if targets is None:
+                # legalmoves応答が未着の間は擬似合法手で即時表示し、
+                # 正確な集合が届いたら通常経路で上書きされる。
+                if self.waiting_legal_moves or not self._legal_moves_set:
+                    targets = frozenset(self.board_state.pseudo_legal_from(self.selected_square))
+                else:
+                    targets = empty
+        else:
+            targets = empty
+        if targets == self._last_highlight_targets:
+            return
+        self._last_highlight_targets = targets
+        self.board_widget.set_highlight_targets(targets)
 
     def _apply_human_move(self, move: str) -> bool:
+        # エンジンの合法手リストがあれば、盤面を触る前に集合で弾く。
+        if self._legal_moves_set and move not in self._legal_moves_set:
+            self._append_log(f"無効な手です: {move}")
+            return False
         try:
             self.board_state.apply_move(move)
         except ValueError as exc:
             self._append_log(f"無効な手です: {exc}")
             return False
 
-        self.move_history.append(move)
+        self._append_history(move)
         self.pending_user_move = move
         self.awaiting_engine_move = True
         self._update_player_controls()
-        self.audio_manager.play_move_sound()
+        if self.audio_enabled:
+            self.audio_manager.play_move_sound()
         self._append_log(f"{self._format_actor_label(self.HUMAN_COLOR)}: {move}")
         self._refresh_views()
         self._record_position()
         if self.game_over:
             return True
 
-        self._sync_engine_position()
-        self.engine_client.send_line(
-            f"go depth {self.engine_depth} random {self.engine_randomness}"
+        self.engine_client.send_raw(
+            self._position_cmd_b
+            + f"\ngo depth {self.engine_depth} random {self.engine_randomness}\n".encode("ascii")
         )
-        self.statusBar().showMessage(f"{self._format_actor_label(self.ENGINE_COLOR)}の思考中…")
+        self._set_status(self._thinking_msg[self.ENGINE_COLOR])
         return True
 
     def _refresh_views(self) -> None:
+        """ビュー更新を次のイベントループ周回へ遅延し、連続呼び出しを1回に畳む。
+
+        人間の着手確定とbestmove処理のように、1入力で複数回呼ばれても
+        実際の更新は_do_refresh_viewsの1回で済む。
+        """
+
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        QTimer.singleShot(0, self._do_refresh_views)
+
+    def _do_refresh_views(self) -> None:
+        self._refresh_pending = False
         self.board_widget.set_board_state(self.board_state)
         self.gote_hand.update_counts(self.board_state.hand_counts(self.ENGINE_COLOR))
         self.sente_hand.update_counts(self.board_state.hand_counts(self.HUMAN_COLOR))
-        self._update_highlight_targets()
-        if not self.awaiting_engine_move:
+        # 遅延実行なので、終局・投了で確定したステータスを上書きしない。
+        if not self.awaiting_engine_move and not self.game_over:
             side = self.board_state.side_to_move
-            self.statusBar().showMessage(f"{self._format_actor_label(side)}の番です")
+            self._set_status(self._turn_msg[side])
         self._update_player_controls()
 
     def _handle_clear_log(self) -> None:
+        self._log_buffer.clear()
         self.log_view.clear()
-        self.statusBar().showMessage("ログをクリアしました")
+        self._set_status("ログをクリアしました")
+
+    def _handle_engine_lines(self, lines: list[str]) -> None:
+        """制御行の一括受け口。
+
+        行の分類（表示専用infoと制御行の振り分け）はEngineClientの
+        読み取りスレッド側で済んでおり、GUIスレッドに届くのは盤面や
+        進行状態を変えうる行だけ。盤面の更新はQtオブジェクトと同じ
+        スレッドで行う必要があるため、ここから先は意図的にメイン
+        スレッドで処理する。"""
+
+        for line in lines:
+            self._handle_engine_line(line)
+
+    def _handle_engine_info_lines(self, lines: list[str]) -> None:
+        """表示専用info行の一括受け口。行ごとのディスパッチを通さない。"""
+
+        self._info_buffer.extend(lines)
+        if not self._info_flush_timer.isActive():
+            self._info_flush_timer.start()
 
     def _handle_engine_line(self, line: str) -> None:
-        if line.startswith("id"):
+        # infoが大量に流れるため、先頭トークンの辞書引きで一発分岐する。
+        head = line.partition(" ")[0]
+        handler = self._usi_handlers.get(head)
+        if handler is not None:
+            handler(line)
             return
-        if line == "usiok":
-            self.engine_client.send_line("isready")
-            return
-        if line == "readyok":
-            self.usi_ready = True
-            self.engine_client.send_line("usinewgame")
-            self._sync_engine_position()
-            self.info_view.clear()
-            self._request_legal_moves()
-            self._refresh_views()
+        self._append_log(f"<< {line}")
+
+    @staticmethod
+    def _on_id_line(line: str) -> None:
+        return
+
+    def _on_usiok(self, _line: str) -> None:
+        self.engine_client.send_line("isready")
+
+    def _on_readyok(self, _line: str) -> None:
+        self.usi_ready = True
+        self.engine_client.send_line("usinewgame")
+        self._sync_engine_position()
+        self.info_view.clear()
+        self._info_buffer.clear()
+        self._request_legal_moves()
+        self._refresh_views()
+        if self.audio_enabled:
             self.audio_manager.play_voice("game_start")
-            return
+
+    def _on_info_line(self, line: str) -> None:
         if line.startswith("info string position error"):
-            self._append_info(line)
-            self._append_log(line)
-            self.waiting_legal_moves = False
-            self._pending_ai_start = None
-            if self.pending_user_move and self.move_history and self.move_history[-1] == self.pending_user_move:
-                self.move_history.pop()
-                self.board_state.load_history(self.move_history)
-                self._rebuild_position_history()
-                self.game_over = False
-                self._clear_drop_selection()
-                self.awaiting_engine_move = False
-                self.pending_user_move = None
-                self._sync_engine_position()
-                self._refresh_views()
-                self._update_player_controls()
-                self.statusBar().showMessage("手を指し直してください")
-                self._request_legal_moves()
-            return
-        if line.startswith("info "):
-            if line.startswith("info string legalmoves error"):
-                self.waiting_legal_moves = False
-            self._append_info(line)
-            return
-        if line.startswith("legalmoves"):
-            self._handle_legalmoves_response(line)
-            return
-        if line.startswith("checkstate"):
-            self._handle_checkstate(line)
-            return
-        if line.startswith("bestmove"):
-            move = line.split(" ", 1)[1].strip()
-            self._handle_bestmove(move)
+            self._on_position_error(line)
             return
+        if line.startswith("info string legalmoves error"):
+            self.waiting_legal_moves = False
+        self._append_info(line)
 
-        self._append_log(f"<< {line}")
+    def _on_position_error(self, line: str) -> None:
+        self._append_info(line)
+        self._append_log(line)
+        self.waiting_legal_moves = False
+        self._pending_ai_start = None
+        if self.pending_user_move and self.move_history and self.move_history[-1] == self.pending_user_move:
+            self.move_history.pop()
+            # 巻き戻しは稀なので、ここだけはペイロードを作り直す。
+            self._rebuild_position_cmd()
+            self.board_state.load_history(self.move_history)
+            self._undo_last_position()
+            self.game_over = False
+            self._clear_drop_selection()
+            self.awaiting_engine_move = False
+            self.pending_user_move = None
+            self._sync_engine_position()
+            self._refresh_views()
+            self._update_player_controls()
+            self._set_status("手を指し直してください")
+            self._request_legal_moves()
+
+    def _on_bestmove_line(self, line: str) -> None:
+        self._handle_bestmove(line.split(" ", 1)[1].strip())
 
     def _handle_bestmove(self, move: str) -> None:
         if not self.awaiting_engine_move:
@@ -1025,7 +1549,7 @@ class MainWindow(QMainWindow):
         if move == "resign":
             label = self._format_actor_label(moving_color)
             self._append_log(f"{label}が投了しました")
-            self.statusBar().showMessage(f"{label}が投了しました")
+            self._set_status(f"{label}が投了しました")
             self.game_over = True
             self._update_player_controls()
             return
@@ -1034,9 +1558,10 @@ class MainWindow(QMainWindow):
         except ValueError as exc:
             self._append_log(f"エンジン手適用エラー: {exc}")
             return
-        self.move_history.append(move)
+        self._append_history(move)
         self._append_log(f"{self._format_actor_label(moving_color)}: {move}")
-        self.audio_manager.play_move_sound()
+        if self.audio_enabled:
+            self.audio_manager.play_move_sound()
         self._refresh_views()
         self._record_position()
         if self.game_over:
@@ -1056,36 +1581,86 @@ class MainWindow(QMainWindow):
         self.waiting_legal_moves = False
         self._pending_ai_start = None
         self._update_player_controls()
-        self.statusBar().showMessage("エンジン停止")
+        self._set_status("エンジン停止")
 
     def _append_log(self, message: str) -> None:
-        self.log_view.append(message)
+        self._log_buffer.append(message)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_log_buffer(self) -> None:
+        buffer = self._log_buffer
+        if not buffer:
+            return
+        self.log_view.append("\n".join(buffer))
+        buffer.clear()
 
     def _append_info(self, message: str) -> None:
-        self.info_view.append(message)
+        self._info_buffer.append(message)
+        if not self._info_flush_timer.isActive():
+            self._info_flush_timer.start()
 
-    def _sync_engine_position(self) -> None:
-        if not self.usi_ready:
+    def _flush_info_buffer(self) -> None:
+        buffer = self._info_buffer
+        if not buffer:
+            return
+        self.info_view.append("\n".join(buffer))
+        buffer.clear()
+
+    def _set_status(self, message: str) -> None:
+        """ステータスバー更新。同文のshowMessage連打を抑える。"""
+
+        if message == self._last_status_msg:
+            return
+        self._last_status_msg = message
+        self.statusBar().showMessage(message)
+
+    def _set_selection(self, square: Optional[str], drop_mode: bool = False) -> None:
+        """盤面ウィジェットへの選択反映。変化がなければ触らない。"""
+
+        selection = (square, drop_mode)
+        if selection == self._last_selection:
             return
+        self._last_selection = selection
+        self.board_widget.set_selection(square, drop_mode)
+
+    def _append_history(self, move: str) -> None:
+        move_b = move.encode("ascii")
+        if self.move_history:
+            self._position_cmd_b += b" " + move_b
+        else:
+            self._position_cmd_b = b"position startpos moves " + move_b
+        self.move_history.append(move)
+
+    def _rebuild_position_cmd(self) -> None:
         if self.move_history:
-            moves_text = " ".join(self.move_history)
-            self.engine_client.send_line(f"position startpos moves {moves_text}")
+            moves_b = " ".join(self.move_history).encode("ascii")
+            self._position_cmd_b = b"position startpos moves " + moves_b
         else:
-            self.engine_client.send_line("position startpos")
+            self._position_cmd_b = b"position startpos"
+
+    def _sync_engine_position(self) -> None:
+        if not self.usi_ready:
+            return
+        self.engine_client.send_raw(self._position_cmd_b + b"\n")
 
     def _handle_legalmoves_response(self, line: str) -> None:
         parts = line.split()
-        moves = parts[1:] if len(parts) > 1 else []
-        self.legal_moves = moves
+        moves = self.legal_moves
+        moves.clear()
+        if len(parts) > 1:
+            moves.extend(parts[1:])
+        self._index_legal_moves(moves)
         self.waiting_legal_moves = False
         self._update_highlight_targets()
         self._check_game_over_conditions()
         self._maybe_start_engine_turn()
 
     def _handle_checkstate(self, line: str) -> None:
-        parts = line.split(maxsplit=1)
-        value = parts[1].strip().lower() if len(parts) > 1 else ""
-        self.in_check = value in {"1", "true", "yes"}
+        # 値は"true"/"false"等の固定語彙なので先頭1文字で判定できる。
+        value = line.partition(" ")[2]
+        self.in_check = bool(value) and value[0] in "1tyTY"
+        self._state_epoch += 1
         self._update_check_indicator()
         self._check_game_over_conditions()
 
@@ -1097,7 +1672,8 @@ class MainWindow(QMainWindow):
             or self.game_over
         ):
             return
-        self.legal_moves = []
+        self.legal_moves.clear()
+        self._index_legal_moves(self.legal_moves)
         self._update_highlight_targets()
         self.engine_client.send_line("legalmoves")
         self.waiting_legal_moves = True
@@ -1113,30 +1689,45 @@ class MainWindow(QMainWindow):
         if self.game_over:
             return
         key = self.board_state.repetition_key()
-        self.position_history.append(key)
-        self.position_counts[key] += 1
-        if self.position_counts[key] >= 4:
+        history = self.position_history
+        if len(history) == history.maxlen:
+            # 上限到達時は最古の局面を繰り返しカウントからも取り除く。
+            oldest = history.popleft()
+            old_count = self.position_counts[oldest] - 1
+            if old_count:
+                self.position_counts[oldest] = old_count
+            else:
+                del self.position_counts[oldest]
+        history.append(key)
+        count = self.position_counts[key] + 1
+        self.position_counts[key] = count
+        if count >= 4:
             self._handle_repetition()
 
-    def _rebuild_position_history(self) -> None:
-        temp_state = BoardState()
-        self.position_counts.clear()
-        self.position_history.clear()
-        key = temp_state.repetition_key()
-        self.position_counts[key] = 1
-        self.position_history.append(key)
-        for move in self.move_history:
-            try:
-                temp_state.apply_move(move)
-            except ValueError:
-                break
-            key = temp_state.repetition_key()
-            self.position_history.append(key)
-            self.position_counts[key] += 1
+    def _undo_last_position(self) -> None:
+        """直近の_record_position一回分を取り消す。
+
+        position_history自体が記録順のスタックなので、巻き戻しは末尾を
+        1件外してカウントを戻すだけで済む。全手リプレイは不要。
+        """
+
+        if len(self.position_history) <= 1:
+            return
+        key = self.position_history.pop()
+        count = self.position_counts[key] - 1
+        if count:
+            self.position_counts[key] = count
+        else:
+            del self.position_counts[key]
 
     def _check_game_over_conditions(self) -> None:
         if self.game_over or self.waiting_legal_moves:
             return
+        # bestmove→legalmoves→checkstateと続けて呼ばれるため、
+        # 判定入力が変わっていなければ世代比較だけで抜ける。
+        if self._state_epoch == self._last_gameover_check_epoch:
+            return
+        self._last_gameover_check_epoch = self._state_epoch
         if self.legal_moves:
             return
 
@@ -1239,15 +1830,15 @@ class MainWindow(QMainWindow):
         self._clear_drop_selection()
         self.waiting_legal_moves = False
         self._pending_ai_start = None
-        self.board_widget.set_selection(None, drop_mode=False)
+        self._set_selection(None, drop_mode=False)
         self.board_widget.set_highlight_targets([])
-        self.statusBar().showMessage(status_message)
+        self._set_status(status_message)
         self._append_log(log_message)
         self._update_player_controls()
         QMessageBox.information(self, dialog_title, dialog_message)
 
     def _update_check_indicator(self) -> None:
-        if not hasattr(self, "check_indicator"):
+        if self.check_indicator is None:
             return
         if self.in_check:
             self.check_indicator.setText("王手: 受けています")
@@ -1258,10 +1849,7 @@ class MainWindow(QMainWindow):
 
     @staticmethod
     def _is_promotion_rank(coord: str, color: str) -> bool:
-        rank = coord[1]
-        if color == "b":
-            return rank == "a"
-        return rank == "e"
+        return coord in _PROMOTION_SQUARES[color]
 
 
 def main() -> int:
@@ -0,0 +1,18 @@
+"""テスト全体で共有するsys.pathブートストラップ。
+
+srcレイアウトのパッケージを未インストールのまま読み込めるようにする。
+conftest.pyはセッション（xdistではワーカー）ごとに1回だけ実行されるため、
+各テストモジュールでパス解決を繰り返さずに済む。
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+
+# Path.resolve()はrealpathのsyscall連鎖を伴う。パス合成だけならos.pathで足りる。
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
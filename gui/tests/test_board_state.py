@@ -2,61 +2,73 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-import sys
-
 import pytest
 
+from ginko_gui.main import BoardState, Piece
 
-ROOT = Path(__file__).resolve().parents[1]
-SRC_DIR = ROOT / "src"
-if str(SRC_DIR) not in sys.path:
-    sys.path.insert(0, str(SRC_DIR))
 
+# apply_moveは駒インスタンスを書き換えない（成りは差し替え）ので共有できる。
+BLACK_PAWN = Piece("b", "P")
 
-from ginko_gui.main import BoardState, Piece  # noqa: E402  pylint: disable=wrong-import-position
+# 升が空だった場合もassert 1回で駒種不一致として報告するための番兵。
+_MISSING = Piece("?", "?")
 
 
 @pytest.fixture()
 def board_state() -> BoardState:
-    state = BoardState()
-    state.reset()
+    # BoardState()は共有テンプレートの浅いコピーで初期局面を構築するため、
+    # テストごとの生成コストはdictコピー程度。追加のreset()は不要。
+    return BoardState()
+
+
+def _setup_drop_on_final_rank(state: BoardState) -> BoardState:
+    state.hands["b"]["P"] = 1
+    return state
+
+
+def _setup_double_pawn(state: BoardState) -> BoardState:
+    state.board["1c"] = BLACK_PAWN
+    state.hands["b"]["P"] = 1
+    return state
+
+
+def _setup_must_promote(_state: BoardState) -> BoardState:
+    # 初期配置は不要なので、fixtureの状態ごと空盤面に差し替える。
+    state = BoardState.empty()
+    state.board["1b"] = BLACK_PAWN
+    return state
+
+
+def _setup_optional_promote(_state: BoardState) -> BoardState:
+    state = BoardState.empty()
+    state.board["2b"] = BLACK_PAWN
     return state
 
 
-def test_pawn_drop_forbidden_on_final_rank(board_state: BoardState) -> None:
-    board_state.hands["b"]["P"] = 1
-    board_state.side_to_move = "b"
-    with pytest.raises(ValueError):
-        board_state.apply_move("P*1a")
-
-
-def test_pawn_drop_forbidden_double_pawn(board_state: BoardState) -> None:
-    board_state.board["1c"] = Piece("b", "P")
-    board_state.hands["b"]["P"] = 1
-    board_state.side_to_move = "b"
-    with pytest.raises(ValueError):
-        board_state.apply_move("P*1d")
-
-
-def test_pawn_must_promote_on_last_rank(board_state: BoardState) -> None:
-    board_state.board.clear()
-    board_state.hands["b"].clear()
-    board_state.board["1b"] = Piece("b", "P")
-    board_state.side_to_move = "b"
-    board_state.apply_move("1b1a")
-    piece = board_state.board["1a"]
-    assert piece is not None
-    assert piece.kind == "+P"
-
-
-def test_pawn_promotion_applies(board_state: BoardState) -> None:
-    board_state.board.clear()
-    board_state.hands["b"].clear()
-    board_state.board["2b"] = Piece("b", "P")
-    board_state.side_to_move = "b"
-    board_state.apply_move("2b2a+")
-    piece = board_state.board["2a"]
-    assert piece is not None
-    assert piece.kind == "+P"
-    assert board_state.side_to_move == "w"
+# (前処理, 指し手, 期待する例外メッセージ断片, 成功時に確認する升と駒種)
+PAWN_CASES = [
+    pytest.param(_setup_drop_on_final_rank, "P*1a", "打てません", None, id="drop-final-rank"),
+    pytest.param(_setup_double_pawn, "P*1d", "二歩", None, id="double-pawn"),
+    pytest.param(_setup_must_promote, "1b1a", None, ("1a", "+P"), id="must-promote"),
+    pytest.param(_setup_optional_promote, "2b2a+", None, ("2a", "+P"), id="optional-promote"),
+]
+
+
+@pytest.mark.parametrize(("setup", "move", "error", "expect"), PAWN_CASES)
+def test_pawn_rules(
+    board_state: BoardState,
+    setup,
+    move: str,
+    error,
+    expect,
+) -> None:
+    state = setup(board_state)
+    state.side_to_move = "b"
+    if error is not None:
+        with pytest.raises(ValueError, match=error):
+            state.apply_move(move)
+        return
+    state.apply_move(move)
+    coord, kind = expect
+    assert state.board.get(coord, _MISSING).kind == kind
+    assert state.side_to_move == "w"